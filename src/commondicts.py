@@ -4,6 +4,7 @@
 # Library imports
 import potentialflowvisualizer as pfv
 import math as m
+from src.flowkernels import freestream_contribution, doublet_contribution, source_contribution, vortex_contribution
 
 ## Dictionaries
 """
@@ -18,6 +19,17 @@ TYPE_NAME_DICT = {
     pfv.LineSource  : "LineSource",
 }
 
+"""
+Fused contribution kernels attached to flow objects from potentialflowvisualizer module.
+Dictionary used in the calculate_contribution() function, objects not listed fall back on their get_*_at() methods.
+"""
+CONTRIBUTION_FUNC_DICT = {
+    pfv.Freestream  : freestream_contribution,
+    pfv.Source      : source_contribution,
+    pfv.Doublet     : doublet_contribution,
+    pfv.Vortex      : vortex_contribution,
+}
+
 """
 String name used in main.py for adding presets to the flow.
 """
@@ -50,3 +62,59 @@ LONG_NAME_DICT = {
     "velmag": "Velocity Magnitude",
     "pressure": "Pressure Coefficient",
 }
+
+"""
+Hover templates of the contour plots used in the draw() function.
+'<extra></extra>' removes the trace name from hover text.
+"""
+HOVERTEMPLATE_DICT = {
+    "xvel":           'x = %{x:.4f}<br>y = %{y:.4f}<br>u = %{z:.4e}<extra></extra>',
+    "pressure":       'x = %{x:.4f}<br>y = %{y:.4f}<br>Cp = %{z:.4e}<extra></extra>',
+    "potential":      'x = %{x:.4f}<br>y = %{y:.4f}<br>phi = %{z:.4e}<extra></extra>',
+    "streamfunction": 'x = %{x:.4f}<br>y = %{y:.4f}<br>psi = %{z:.4e}<extra></extra>',
+}
+
+"""
+Contour properties shared by all contour plots in the draw() function.
+"""
+CONTOUR_STYLE_DICT = {
+    "contours_showlines": False,
+    "showscale":          True,
+}
+
+"""
+Colorbar properties shared by all contour plots in the draw() function.
+"""
+COLORBAR_STYLE_DICT = {
+    "title_side": 'right',
+    "ticks":      "inside",
+    "len":        0.45,     ## vertical height of colorbar, expressed in a fraction of graph height, final height reduced by ypad
+    "tickwidth":  2,
+    "ticklen":    10,
+    "ypad":       0,
+}
+
+"""
+Axis properties shared by the x- and y-axes in the draw() function.
+"""
+AXIS_STYLE_DICT = {
+    "title_font_color": '#000000',
+    "title_standoff":   0,
+    "gridcolor":        'rgba(153, 153, 153, 0.75)', #999999 in RGB, 0.75 opacity
+    "gridwidth":        1,
+    "zerolinecolor":    '#000000',
+    "zerolinewidth":    2,
+    "linecolor":        '#000000',
+    "linewidth":        1,
+    "ticks":            'outside',
+    "ticklen":          10,
+    "tickwidth":        2,
+    "tickcolor":        '#000000',
+    "tickfont_color":   '#000000',
+    "minor_showgrid":   True,
+    "minor_gridcolor":  'rgba(221, 221, 221, 0.50)', #DDDDDD in RGB, 0.50 opacity
+    "minor_ticks":      'outside',
+    "minor_ticklen":    5,
+    "minor_tickwidth":  2,
+    "minor_griddash":   'dot',
+}
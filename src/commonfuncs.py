@@ -2,7 +2,8 @@
 # -*- coding: utf-8 -*-
 
 # Library imports
-from src.commondicts import TYPE_NAME_DICT
+import numpy as np
+from src.commondicts import TYPE_NAME_DICT, CONTRIBUTION_FUNC_DICT
 
 ## Functions
 def flow_element_type(object):
@@ -27,3 +28,49 @@ def flow_element_type(object):
         name = "Sink"
 
     return name
+
+def calculate_contribution(object, x, y, out=None):
+    """
+    Given a flow object, returns its x-velocity, y-velocity, velocity potential
+    and stream function at the given points in a single call. Uses the fused
+    kernel from the CONTRIBUTION_FUNC_DICT[] dictionary if the object has one,
+    otherwise falls back on the get_*_at() methods of the object itself.
+
+    Parameters:
+        object : pfv.object
+            Flow object that belongs to the potentialflowvisualizer
+            module.
+        x      : np.ndarray
+            x-coordinates of the points to evaluate, broadcastable with y.
+        y      : np.ndarray
+            y-coordinates of the points to evaluate, broadcastable with x.
+        out    : tuple of np.ndarray, optional
+            Buffers (u, v, phi, psi) that the results are written into.
+    Returns:
+        u, v, phi, psi : np.ndarray
+            x-velocity, y-velocity, velocity potential and stream function.
+    """
+    try:
+        return CONTRIBUTION_FUNC_DICT[object.__class__](object, x, y, out=out)
+    except KeyError:
+        pass
+
+    ## Broadcast x and y straight into the Nx2 layout of the get_*_at() methods, without intermediate flattened copies
+    shape  = np.broadcast_shapes(np.shape(x), np.shape(y))
+    points = np.empty(shape + (2,), dtype=np.result_type(x, y))
+    points[..., 0] = x
+    points[..., 1] = y
+    points = points.reshape(-1, 2)
+
+    contribution = (np.reshape(object.get_x_velocity_at(points), shape),
+                    np.reshape(object.get_y_velocity_at(points), shape),
+                    np.reshape(object.get_potential_at(points), shape),
+                    np.reshape(object.get_streamfunction_at(points), shape)
+                   )
+    if out is None:
+        return contribution
+
+    for buffer, value in zip(out, contribution):
+        np.copyto(buffer, value)
+
+    return out
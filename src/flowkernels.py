@@ -0,0 +1,312 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Fused contribution kernels for the flow objects of the potentialflowvisualizer
+module. Each kernel evaluates the x-velocity, y-velocity, velocity potential and
+stream function of a single flow object in one pass, such that subexpressions
+shared between the four quantities (dx, dy, r^2, ...) are only computed once.
+The results are identical to the get_*_at() methods of the flow object, but
+transcendental functions are only evaluated on the grid where the quantity
+itself requires them (log and arctan2 of source and vortex).
+"""
+
+# Library imports
+import numpy as np
+import math as m
+import potentialflowvisualizer as pfv
+try:
+    import numba as nb
+except ImportError:     ## Numba is optional, the NumPy kernels below are used without it
+    nb = None
+
+INV_2PI = 0.5 / m.pi     ## Every point element scales with k = strength / (2 pi)
+
+## Functions
+def _get_outputs(x, y, out):
+    """
+    Returns the four output buffers of a kernel, allocating them with the
+    broadcast shape of x and y if the caller did not supply any.
+    """
+    if out is None:
+        shape = np.broadcast_shapes(np.shape(x), np.shape(y))
+        dtype = np.result_type(x, y)
+        out   = (np.empty(shape, dtype), np.empty(shape, dtype), np.empty(shape, dtype), np.empty(shape, dtype))
+
+    return out
+
+def freestream_contribution(object, x, y, out=None):
+    """
+    Contribution of a uniform flow (pfv.Freestream).
+
+    Parameters:
+        object : pfv.Freestream
+            Uniform flow object.
+        x      : np.ndarray
+            x-coordinates of the points to evaluate, broadcastable with y.
+        y      : np.ndarray
+            y-coordinates of the points to evaluate, broadcastable with x.
+        out    : tuple of np.ndarray, optional
+            Buffers (u, v, phi, psi) that the results are written into.
+    Returns:
+        u, v, phi, psi : np.ndarray
+            x-velocity, y-velocity, velocity potential and stream function.
+    """
+    u, v, phi, psi = _get_outputs(x, y, out)
+
+    np.multiply(x, object.u, out=u)             ## u is used as scratch space before being filled
+    np.multiply(y, object.v, out=phi)
+    phi += u
+    np.multiply(x, -object.v, out=u)
+    np.multiply(y, object.u, out=psi)
+    psi += u
+    u.fill(object.u)
+    v.fill(object.v)
+
+    return u, v, phi, psi
+
+def doublet_contribution(object, x, y, out=None):
+    """
+    Contribution of a doublet (pfv.Doublet). The orientation of the doublet
+    only enters through the scalars cos(alpha) and sin(alpha).
+
+    Parameters:
+        object : pfv.Doublet
+            Doublet flow object.
+        x      : np.ndarray
+            x-coordinates of the points to evaluate, broadcastable with y.
+        y      : np.ndarray
+            y-coordinates of the points to evaluate, broadcastable with x.
+        out    : tuple of np.ndarray, optional
+            Buffers (u, v, phi, psi) that the results are written into.
+    Returns:
+        u, v, phi, psi : np.ndarray
+            x-velocity, y-velocity, velocity potential and stream function.
+    """
+    u, v, phi, psi = _get_outputs(x, y, out)
+    k       = object.strength * INV_2PI
+    c       = m.cos(object.alpha)                ## Python floats, such that the dtype of x and y is kept
+    s       = m.sin(object.alpha)
+
+    dx      = x - object.x
+    dy      = y - object.y
+    inv_r2  = dx*dx + dy*dy
+    np.reciprocal(inv_r2, out=inv_r2)           ## 1/r^2 once, every other use is a multiplication
+    p       = dx*c + dy*s                       ## (dx cos(alpha) + dy sin(alpha)) / r^2
+    p      *= inv_r2
+
+    ## Scalar factors, folded once per object such that no grid pass is spent on scaling
+    k2      = 2*k
+    kc      = k*c
+    ks      = k*s
+
+    ## u = -k (c - 2 dx p) / r^2 = (2k dx p - kc) / r^2
+    np.multiply(dx, p, out=u)
+    u      *= k2
+    u      -= kc
+    u      *= inv_r2
+    ## v = -k (s - 2 dy p) / r^2 = (2k dy p - ks) / r^2
+    np.multiply(dy, p, out=v)
+    v      *= k2
+    v      -= ks
+    v      *= inv_r2
+    ## phi = -k p
+    np.multiply(p, -k, out=phi)
+    ## psi = k (dx s + dy c) / r^2 = (ks dx + kc dy) / r^2
+    np.multiply(dx, ks, out=psi)
+    np.multiply(dy, kc, out=p)                  ## p is no longer needed, reuse as scratch space
+    psi    += p
+    psi    *= inv_r2
+
+    return u, v, phi, psi
+
+def source_contribution(object, x, y, out=None):
+    """
+    Contribution of a source or sink (pfv.Source).
+
+    Parameters:
+        object : pfv.Source
+            Source flow object.
+        x      : np.ndarray
+            x-coordinates of the points to evaluate, broadcastable with y.
+        y      : np.ndarray
+            y-coordinates of the points to evaluate, broadcastable with x.
+        out    : tuple of np.ndarray, optional
+            Buffers (u, v, phi, psi) that the results are written into.
+    Returns:
+        u, v, phi, psi : np.ndarray
+            x-velocity, y-velocity, velocity potential and stream function.
+    """
+    u, v, phi, psi = _get_outputs(x, y, out)
+    k       = object.strength * INV_2PI
+
+    dx      = x - object.x
+    dy      = y - object.y
+    r2      = dx*dx + dy*dy
+
+    ## phi = k ln(r) = k/2 ln(r^2)
+    np.log(r2, out=phi)
+    phi    *= 0.5*k
+    ## psi = k theta
+    np.arctan2(dy, dx, out=psi)
+    psi    *= k
+    ## u = k dx / r^2, v = k dy / r^2
+    np.divide(k, r2, out=r2)                    ## r2 is no longer needed, reuse as k / r^2
+    np.multiply(dx, r2, out=u)
+    np.multiply(dy, r2, out=v)
+
+    return u, v, phi, psi
+
+def vortex_contribution(object, x, y, out=None):
+    """
+    Contribution of a point vortex (pfv.Vortex).
+
+    Parameters:
+        object : pfv.Vortex
+            Vortex flow object.
+        x      : np.ndarray
+            x-coordinates of the points to evaluate, broadcastable with y.
+        y      : np.ndarray
+            y-coordinates of the points to evaluate, broadcastable with x.
+        out    : tuple of np.ndarray, optional
+            Buffers (u, v, phi, psi) that the results are written into.
+    Returns:
+        u, v, phi, psi : np.ndarray
+            x-velocity, y-velocity, velocity potential and stream function.
+    """
+    u, v, phi, psi = _get_outputs(x, y, out)
+    k       = object.strength * INV_2PI
+
+    dx      = x - object.x
+    dy      = y - object.y
+    r2      = dx*dx + dy*dy
+
+    ## phi = k theta
+    np.arctan2(dy, dx, out=phi)
+    phi    *= k
+    ## psi = k ln(r) = k/2 ln(r^2)
+    np.log(r2, out=psi)
+    psi    *= 0.5*k
+    ## u = -k dy / r^2, v = k dx / r^2
+    np.divide(k, r2, out=r2)                    ## r2 is no longer needed, reuse as k / r^2
+    np.multiply(dy, r2, out=u)
+    u      *= -1
+    np.multiply(dx, r2, out=v)
+
+    return u, v, phi, psi
+
+## Numba accelerated accumulation
+"""
+Kind tags and parameter packing of the flow objects that are handled by the
+compiled accumulate_contributions() kernel. Each object is described by one
+row of 5 parameters:
+    Freestream : u, v
+    Source     : k, x, y
+    Vortex     : k, x, y
+    Doublet    : k, x, y, cos(alpha), sin(alpha)
+with k = strength / (2 pi).
+"""
+FREESTREAM, SOURCE, VORTEX, DOUBLET = 0, 1, 2, 3
+N_PARAMS = 5
+
+_PACK_FUNC_DICT = {
+    pfv.Freestream  : lambda object: (FREESTREAM, (object.u, object.v, 0, 0, 0)),
+    pfv.Source      : lambda object: (SOURCE, (object.strength*INV_2PI, object.x, object.y, 0, 0)),
+    pfv.Vortex      : lambda object: (VORTEX, (object.strength*INV_2PI, object.x, object.y, 0, 0)),
+    pfv.Doublet     : lambda object: (DOUBLET, (object.strength*INV_2PI, object.x, object.y,
+                                                m.cos(object.alpha), m.sin(object.alpha))),
+}
+
+def pack_objects(objects):
+    """
+    Packs the flow objects supported by accumulate_contributions() into
+    kind and parameter arrays.
+
+    Parameters:
+        objects : iterable of pfv.object
+            Flow objects that belong to the potentialflowvisualizer module.
+    Returns:
+        kinds     : np.ndarray
+            (M,) int8 array of kind tags.
+        params    : np.ndarray
+            (M, N_PARAMS) float32 array of object parameters.
+        remaining : list of pfv.object
+            Flow objects that are not supported and still need to be added.
+    """
+    kinds, params, remaining = [], [], []
+    for object in objects:
+        try:
+            kind, param = _PACK_FUNC_DICT[object.__class__](object)
+        except KeyError:
+            remaining.append(object)
+            continue
+        kinds.append(kind)
+        params.append(param)
+
+    kinds  = np.array(kinds, dtype=np.int8)
+    params = np.array(params, dtype=np.float32).reshape(-1, N_PARAMS)
+
+    return kinds, params, remaining
+
+def _accumulate_contributions(x, y, kinds, params, u, v, phi, psi):
+    """
+    Adds the contribution of all packed flow objects to u, v, phi and psi, of
+    shape (len(y), len(x)), in a single compiled pass per object. The rows of
+    the grid are distributed over the threads, and no temporary arrays are
+    created. The kind of an object is resolved once per row, such that the
+    inner loop over x is straight-line arithmetic.
+    """
+    for n in range(kinds.shape[0]):
+        kind = kinds[n]
+        p0, p1, p2, p3, p4 = params[n, 0], params[n, 1], params[n, 2], params[n, 3], params[n, 4]
+        half_k = 0.5*p0                             ## k/2 of the log(r^2) terms, hoisted out of the grid loops
+        for j in nb.prange(y.shape[0]):
+            if kind == FREESTREAM:                  ## p0, p1 = u, v
+                for i in range(x.shape[0]):
+                    u[j, i]   += p0
+                    v[j, i]   += p1
+                    phi[j, i] += p0*x[i] + p1*y[j]
+                    psi[j, i] += p0*y[j] - p1*x[i]
+                continue
+
+            dy = y[j] - p2                          ## p0, p1, p2 = k, x, y
+            if kind == SOURCE:
+                for i in range(x.shape[0]):
+                    dx         = x[i] - p1
+                    r2         = dx*dx + dy*dy
+                    k_r2       = p0/r2              ## Single division per point
+                    u[j, i]   += k_r2*dx
+                    v[j, i]   += k_r2*dy
+                    phi[j, i] += half_k*m.log(r2)
+                    psi[j, i] += p0*m.atan2(dy, dx)
+            elif kind == VORTEX:
+                for i in range(x.shape[0]):
+                    dx         = x[i] - p1
+                    r2         = dx*dx + dy*dy
+                    k_r2       = p0/r2
+                    u[j, i]   -= k_r2*dy
+                    v[j, i]   += k_r2*dx
+                    phi[j, i] += p0*m.atan2(dy, dx)
+                    psi[j, i] += half_k*m.log(r2)
+            else:                                   ## p3, p4 = cos(alpha), sin(alpha)
+                for i in range(x.shape[0]):
+                    dx         = x[i] - p1
+                    inv_r2     = 1/(dx*dx + dy*dy)
+                    p          = (dx*p3 + dy*p4)*inv_r2
+                    u[j, i]   -= p0*(p3 - 2*dx*p)*inv_r2
+                    v[j, i]   -= p0*(p4 - 2*dy*p)*inv_r2
+                    phi[j, i] -= p0*p
+                    psi[j, i] += p0*(dx*p4 + dy*p3)*inv_r2
+
+"""
+The compiled kernel is only used if numba can run more than one thread: on a
+single thread the SIMD float32 log/atan2 ufuncs of NumPy outperform the scalar
+libm calls of the kernel, and the NumPy kernels above are faster.
+No 'nnan'/'ninf' fast-math flags are used, the fields are singular at the object origins.
+"""
+if nb is not None and nb.config.NUMBA_NUM_THREADS > 1:
+    accumulate_contributions = nb.njit(parallel=True, cache=True,
+                                       fastmath={'nsz', 'arcp', 'contract', 'afn', 'reassoc'}
+                                      )(_accumulate_contributions)
+else:
+    accumulate_contributions = None
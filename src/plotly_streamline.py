@@ -3,7 +3,6 @@ from __future__ import absolute_import
 import math
 
 from plotly import exceptions, optional_imports
-from plotly.figure_factory import utils
 from plotly.graph_objs import graph_objs
 
 np = optional_imports.get_module("numpy")
@@ -53,9 +52,9 @@ def create_streamline(
     :param (angle in radians) angle: angle of arrowhead. Default = pi/9
     :param (float in [0,1]) arrow_scale: value to scale length of arrowhead
         Default = .09
-    :param kwargs: kwargs passed through plotly.graph_objs.Scatter
+    :param kwargs: kwargs passed through plotly.graph_objs.Scattergl
         for more information on valid kwargs call
-        help(plotly.graph_objs.Scatter)
+        help(plotly.graph_objs.Scattergl)
 
     :rtype (dict): returns a representation of streamline figure.
 
@@ -109,20 +108,28 @@ def create_streamline(
     >>> fig.add_trace(point) # doctest: +SKIP
     >>> fig.show()
     """
+    # Imported here, importing plotly.figure_factory pulls in all of its
+    # submodules and is only needed once streamlines are drawn
+    from plotly.figure_factory import utils
+
     utils.validate_equal_length(x, y)
     utils.validate_equal_length(u, v)
     validate_streamline(x, y)
     utils.validate_positive_scalars(density=density, arrow_scale=arrow_scale)
 
-    streamline_x, streamline_y = _Streamline(
-        x, y, u, v, density, angle, arrow_scale
-    ).sum_streamlines()
-    arrow_x, arrow_y = _Streamline(
+    # The streamlines are integrated once, in _Streamline.__init__
+    streamline_x, streamline_y, arrow_x, arrow_y = _Streamline(
         x, y, u, v, density, angle, arrow_scale
-    ).get_streamline_arrows()
-
-    streamline = graph_objs.Scatter(
-        x=streamline_x + arrow_x, y=streamline_y + arrow_y, mode="lines", **kwargs
+    ).get_traces()
+
+    # Single precision is plenty for plotting and halves the serialized payload.
+    # The nan-separated polylines are drawn by WebGL in a single draw call
+    # instead of as SVG paths.
+    streamline = graph_objs.Scattergl(
+        x=np.concatenate((streamline_x, arrow_x)).astype(np.float32),
+        y=np.concatenate((streamline_y, arrow_y)).astype(np.float32),
+        mode="lines",
+        **kwargs
     )
 
     data = [streamline]
@@ -146,8 +153,6 @@ class _Streamline(object):
         self.density = int(30 * density)  # Scale similarly to other functions
         self.delta_x = self.x[1] - self.x[0]
         self.delta_y = self.y[1] - self.y[0]
-        self.val_x = self.x
-        self.val_y = self.y
 
         # Set up spacing
         self.blank = np.zeros((self.density, self.density))
@@ -158,16 +163,20 @@ class _Streamline(object):
         # Rescale speed onto axes-coordinates
         self.u = self.u / (self.x[-1] - self.x[0])
         self.v = self.v / (self.y[-1] - self.y[0])
-        self.speed = np.sqrt(self.u**2 + self.v**2)
+        self.speed = np.hypot(self.u, self.v)
 
         # Rescale u and v for integrations.
         self.u *= len(self.x)
         self.v *= len(self.y)
+
+        # Nested lists for the pointwise interpolation in the RK4 integration,
+        # indexing them with Python ints is much cheaper than numpy scalar access
+        self.grid_u = self.u.tolist()
+        self.grid_v = self.v.tolist()
+        self.grid_speed = self.speed.tolist()
         self.st_x = []
         self.st_y = []
         self.get_streamlines()
-        streamline_x, streamline_y = self.sum_streamlines()
-        arrows_x, arrows_y = self.get_streamline_arrows()
 
     def blank_pos(self, xi, yi):
         """
@@ -175,25 +184,30 @@ class _Streamline(object):
         """
         return (int((xi / self.spacing_x) + 0.5), int((yi / self.spacing_y) + 0.5))
 
-    def value_at(self, a, xi, yi):
+    def velocity_at(self, xi, yi):
         """
-        Set up for RK4 function, based on Bokeh's streamline code
+        Set up for RK4 function, based on Bokeh's streamline code. Bilinear
+        interpolation of u/speed and v/speed, with the cell and its weights
+        shared between the three fields
         """
-        if isinstance(xi, np.ndarray):
-            self.x = xi.astype(np.int64)
-            self.y = yi.astype(np.int64)
-        else:
-            self.val_x = np.int64(xi)
-            self.val_y = np.int64(yi)
-        a00 = a[self.val_y, self.val_x]
-        a01 = a[self.val_y, self.val_x + 1]
-        a10 = a[self.val_y + 1, self.val_x]
-        a11 = a[self.val_y + 1, self.val_x + 1]
-        xt = xi - self.val_x
-        yt = yi - self.val_y
-        a0 = a00 * (1 - xt) + a01 * xt
-        a1 = a10 * (1 - xt) + a11 * xt
-        return a0 * (1 - yt) + a1 * yt
+        xb = int(xi)
+        yb = int(yi)
+        xt = xi - xb
+        yt = yi - yb
+        w00 = (1 - xt) * (1 - yt)
+        w01 = xt * (1 - yt)
+        w10 = (1 - xt) * yt
+        w11 = xt * yt
+        values = []
+        for a in (self.grid_speed, self.grid_u, self.grid_v):
+            row0 = a[yb]
+            row1 = a[yb + 1]
+            values.append(
+                row0[xb] * w00 + row0[xb + 1] * w01 + row1[xb] * w10 + row1[xb + 1] * w11
+            )
+        speed, ui, vi = values
+        dt_ds = 1.0 / speed
+        return ui * dt_ds, vi * dt_ds
 
     def rk4_integrate(self, x0, y0):
         """
@@ -203,17 +217,11 @@ class _Streamline(object):
         x and y trajectories then checks length of traj (s in units of axes)
         """
 
-        def f(xi, yi):
-            dt_ds = 1.0 / self.value_at(self.speed, xi, yi)
-            ui = self.value_at(self.u, xi, yi)
-            vi = self.value_at(self.v, xi, yi)
-            return ui * dt_ds, vi * dt_ds
+        f = self.velocity_at
 
         def g(xi, yi):
-            dt_ds = 1.0 / self.value_at(self.speed, xi, yi)
-            ui = self.value_at(self.u, xi, yi)
-            vi = self.value_at(self.v, xi, yi)
-            return -ui * dt_ds, -vi * dt_ds
+            ui, vi = self.velocity_at(xi, yi)
+            return -ui, -vi
 
         check = lambda xi, yi: (0 <= xi < len(self.x) - 1 and 0 <= yi < len(self.y) - 1)
         xb_changes = []
@@ -235,7 +243,9 @@ class _Streamline(object):
                     k2x, k2y = f(xi + 0.5 * ds * k1x, yi + 0.5 * ds * k1y)
                     k3x, k3y = f(xi + 0.5 * ds * k2x, yi + 0.5 * ds * k2y)
                     k4x, k4y = f(xi + ds * k3x, yi + ds * k3y)
-                except IndexError:
+                except (IndexError, ValueError, ArithmeticError):
+                    # Left the grid, or hit a stagnation point / singularity
+                    # (zero speed, nan or inf position)
                     break
                 xi += ds * (k1x + 2 * k2x + 2 * k3x + k4x) / 6.0
                 yi += ds * (k1y + 2 * k2y + 2 * k3y + k4y) / 6.0
@@ -301,21 +311,16 @@ class _Streamline(object):
                 self.traj(indent, xi + indent)
                 self.traj(self.density - 1 - indent, xi + indent)
 
+        # Each streamline is kept as an array, terminated by a nan separator
         self.st_x = [
-            np.array(t[0]) * self.delta_x + self.x[0] for t in self.trajectories
+            np.append(np.array(t[0]) * self.delta_x + self.x[0], np.nan)
+            for t in self.trajectories
         ]
         self.st_y = [
-            np.array(t[1]) * self.delta_y + self.y[0] for t in self.trajectories
+            np.append(np.array(t[1]) * self.delta_y + self.y[0], np.nan)
+            for t in self.trajectories
         ]
 
-        for index in range(len(self.st_x)):
-            self.st_x[index] = self.st_x[index].tolist()
-            self.st_x[index].append(np.nan)
-
-        for index in range(len(self.st_y)):
-            self.st_y[index] = self.st_y[index].tolist()
-            self.st_y[index].append(np.nan)
-
     def get_streamline_arrows(self):
         """
         Makes an arrow for each streamline.
@@ -328,81 +333,81 @@ class _Streamline(object):
         :param (angle in radians) angle: angle of arrowhead. Default = pi/9
         :param (float in [0,1]) arrow_scale: value to scale length of arrowhead
             Default = .09
-        :rtype (list, list) arrows_x: x-values to create arrowhead and
+        :rtype (array, array) arrows_x: x-values to create arrowhead and
             arrows_y: y-values to create arrowhead
         """
         arrow_end_x = np.empty((len(self.st_x)))
         arrow_end_y = np.empty((len(self.st_y)))
         arrow_start_x = np.empty((len(self.st_x)))
         arrow_start_y = np.empty((len(self.st_y)))
-        for index in range(len(self.st_x)):
-            arrow_end_x[index] = self.st_x[index][int(len(self.st_x[index]) / 3)]
-            arrow_start_x[index] = self.st_x[index][
-                (int(len(self.st_x[index]) / 3)) - 1
-            ]
-            arrow_end_y[index] = self.st_y[index][int(len(self.st_y[index]) / 3)]
-            arrow_start_y[index] = self.st_y[index][
-                (int(len(self.st_y[index]) / 3)) - 1
-            ]
+        for index, (st_x, st_y) in enumerate(zip(self.st_x, self.st_y)):
+            # x and y of a streamline have equal length, so split once
+            split = len(st_x) // 3
+            arrow_start_x[index], arrow_end_x[index] = st_x[split - 1], st_x[split]
+            arrow_start_y[index], arrow_end_y[index] = st_y[split - 1], st_y[split]
 
         dif_x = arrow_end_x - arrow_start_x
         dif_y = arrow_end_y - arrow_start_y
 
+        # cos/sin of the streamline angle, taken from the unit direction so
+        # no trig is evaluated per streamline. The original arctan folds the
+        # direction into the right half-plane and the arrowhead is then
+        # placed with a matching sign, these two flips cancel identically.
         orig_err = np.geterr()
         np.seterr(divide="ignore", invalid="ignore")
-        streamline_ang = np.arctan(dif_y / dif_x)
+        inv_len = 1.0 / np.hypot(dif_x, dif_y)
+        cos_ang = dif_x * inv_len
+        sin_ang = dif_y * inv_len
         np.seterr(**orig_err)
 
-        ang1 = streamline_ang + (self.angle)
-        ang2 = streamline_ang - (self.angle)
-
-        seg1_x = np.cos(ang1) * self.arrow_scale
-        seg1_y = np.sin(ang1) * self.arrow_scale
-        seg2_x = np.cos(ang2) * self.arrow_scale
-        seg2_y = np.sin(ang2) * self.arrow_scale
-
-        point1_x = np.empty((len(dif_x)))
-        point1_y = np.empty((len(dif_y)))
-        point2_x = np.empty((len(dif_x)))
-        point2_y = np.empty((len(dif_y)))
-
-        for index in range(len(dif_x)):
-            if dif_x[index] >= 0:
-                point1_x[index] = arrow_end_x[index] - seg1_x[index]
-                point1_y[index] = arrow_end_y[index] - seg1_y[index]
-                point2_x[index] = arrow_end_x[index] - seg2_x[index]
-                point2_y[index] = arrow_end_y[index] - seg2_y[index]
-            else:
-                point1_x[index] = arrow_end_x[index] + seg1_x[index]
-                point1_y[index] = arrow_end_y[index] + seg1_y[index]
-                point2_x[index] = arrow_end_x[index] + seg2_x[index]
-                point2_y[index] = arrow_end_y[index] + seg2_y[index]
-
-        space = np.empty((len(point1_x)))
-        space[:] = np.nan
-
-        # Combine arrays into matrix
-        arrows_x = np.matrix([point1_x, arrow_end_x, point2_x, space])
-        arrows_x = np.array(arrows_x)
-        arrows_x = arrows_x.flatten("F")
-        arrows_x = arrows_x.tolist()
-
-        # Combine arrays into matrix
-        arrows_y = np.matrix([point1_y, arrow_end_y, point2_y, space])
-        arrows_y = np.array(arrows_y)
-        arrows_y = arrows_y.flatten("F")
-        arrows_y = arrows_y.tolist()
+        # Rotate by +/- the arrowhead angle: cos(a +/- b), sin(a +/- b)
+        cos_b = math.cos(self.angle) * self.arrow_scale
+        sin_b = math.sin(self.angle) * self.arrow_scale
+
+        point1_x = arrow_end_x - (cos_ang * cos_b - sin_ang * sin_b)
+        point1_y = arrow_end_y - (sin_ang * cos_b + cos_ang * sin_b)
+        point2_x = arrow_end_x - (cos_ang * cos_b + sin_ang * sin_b)
+        point2_y = arrow_end_y - (sin_ang * cos_b - cos_ang * sin_b)
+
+        space = np.full(len(point1_x), np.nan)
+
+        # Interleave the arrowhead points, one nan-separated arrow per streamline
+        arrows_x = np.stack([point1_x, arrow_end_x, point2_x, space]).ravel("F")
+        arrows_y = np.stack([point1_y, arrow_end_y, point2_y, space]).ravel("F")
 
         return arrows_x, arrows_y
 
-    def sum_streamlines(self):
+    def sum_streamlines(self, stride=2):
         """
         Makes all streamlines readable as a single trace.
 
-        :rtype (list, list): streamline_x: all x values for each streamline
-            combined into single list and streamline_y: all y values for each
-            streamline combined into single list
+        The RK4 integration places a point every 1% of the axis length,
+        finer than a plotted polyline needs, so only every stride-th point
+        is kept. The last point and nan separator of each streamline are
+        always kept.
+
+        :param (int) stride: keep every stride-th point of a streamline
+        :rtype (array, array): streamline_x: all x values for each streamline
+            combined into single array and streamline_y: all y values for each
+            streamline combined into single array
         """
-        streamline_x = sum(self.st_x, [])
-        streamline_y = sum(self.st_y, [])
+        if not self.st_x:
+            return np.empty(0), np.empty(0)
+        streamline_x = np.concatenate(
+            [np.concatenate((st[:-2:stride], st[-2:])) for st in self.st_x]
+        )
+        streamline_y = np.concatenate(
+            [np.concatenate((st[:-2:stride], st[-2:])) for st in self.st_y]
+        )
         return streamline_x, streamline_y
+
+    def get_traces(self):
+        """
+        Streamline and arrowhead coordinates of the integrated trajectories.
+
+        :rtype (array, array, array, array): streamline_x, streamline_y,
+            arrows_x, arrows_y
+        """
+        streamline_x, streamline_y = self.sum_streamlines()
+        arrows_x, arrows_y = self.get_streamline_arrows()
+        return streamline_x, streamline_y, arrows_x, arrows_y